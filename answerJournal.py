@@ -0,0 +1,364 @@
+import os
+import json
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from databaseSetup import COURSE_TABLES, fetch_questions_by_id
+
+# ===== Public constants =====
+JOURNAL_DIR = "quiz_journals"
+
+# Record tags (one record per line)
+_HEADER = "Q"   # Q <json list of questions>   -- written once, fixes the question order
+_ANSWER = "A"   # A <question id> <letter>      -- appended on every click, last one wins
+
+
+class JournalLockedError(RuntimeError):
+    """Another quiz window already has this course's journal open."""
+
+
+def journal_path(course_label: str, journal_dir: str = JOURNAL_DIR) -> str:
+    if course_label not in COURSE_TABLES:
+        raise ValueError(f"Unknown course label: {course_label}")
+    return os.path.join(journal_dir, f"{COURSE_TABLES[course_label]}.jnl")
+
+def _fsync_dir(path: str) -> None:
+    """
+    Persist a directory entry (new/renamed file). Not supported on Windows; skip there.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _trim_torn_tail(path: str) -> None:
+    """
+    Cut off a half-written last record so new appends start on a clean line.
+    """
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+# ===== Locking =====
+def _acquire_lock(path: str) -> int:
+    """
+    Take an exclusive OS lock on `<journal>.lock` and return its fd.
+    The OS drops the lock if the process dies, so a crash never leaves a stale lock.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        raise JournalLockedError(f"Journal is in use by another window: {path}")
+    return fd
+
+def _release_lock(fd: int) -> None:
+    try:
+        if msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+# ===== Reading =====
+def read_journal(path: str) -> Optional[Tuple[List[Dict], Dict[int, str]]]:
+    """
+    Returns (questions, answers) from an existing journal, or None if there is nothing to resume.
+    A torn last line (crash mid-append) is ignored.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return None
+
+    # Anything after the final newline never finished writing.
+    lines = lines[:-1]
+    if not lines or not lines[0].startswith(_HEADER + " "):
+        return None
+    try:
+        questions: List[Dict] = json.loads(lines[0][2:])
+    except ValueError:
+        return None
+
+    valid_ids = {q["id"] for q in questions}
+    answers: Dict[int, str] = {}
+    for line in lines[1:]:
+        parts = line.split(" ")
+        if len(parts) != 3 or parts[0] != _ANSWER:
+            continue
+        try:
+            qid = int(parts[1])
+        except ValueError:
+            continue
+        if qid in valid_ids and parts[2] in ("A", "B", "C", "D"):
+            # Re-insert so dict order follows the most recent click.
+            answers.pop(qid, None)
+            answers[qid] = parts[2]
+    return questions, answers
+
+def _matches_db(saved: List[Dict], current: List[Dict]) -> bool:
+    """
+    True if every saved question still exists unchanged (text, options, answer, explanation).
+    """
+    by_id = {q["id"]: q for q in current}
+    return all(by_id.get(q["id"]) == q for q in saved)
+
+# ===== Writing =====
+class AnswerJournal:
+    """
+    Append-only log of answers for one in-progress quiz.
+
+    `record()` only enqueues; a background thread writes whatever has queued up
+    and fsyncs once per batch, so radio-button clicks never wait on the disk.
+    If a write fails the thread stops and the exception is kept in `error`.
+    """
+
+    def __init__(self, path: str, lock_fd: Optional[int] = None) -> None:
+        self.path = path
+        self.error: Optional[BaseException] = None
+        self._lock_fd = lock_fd
+        _trim_torn_tail(path)
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._writer, name="answer-journal", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def create(cls, path: str, questions: List[Dict], lock_fd: Optional[int] = None) -> "AnswerJournal":
+        """
+        Start a fresh journal holding the question order. Written atomically, so a
+        crash leaves either the old journal or the complete new header.
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"{_HEADER} {json.dumps(questions, separators=(',', ':'))}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(directory)
+        return cls(path, lock_fd)
+
+    def record(self, qid: int, letter: str) -> None:
+        if self.error is None and self._thread.is_alive():
+            self._queue.put(f"{_ANSWER} {qid} {letter}\n")
+
+    def _writer(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Group commit: take everything queued behind the first record too.
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in batch
+            records = [r for r in batch if r is not None]
+            if records:
+                try:
+                    self._file.write("".join(records))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except Exception as e:
+                    self.error = e
+                    return
+            if done:
+                return
+
+    def _close_file(self) -> None:
+        """
+        Stop the writer and close the file. Errors (e.g. a failed final flush) go to `error`.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if not self._file.closed:
+            try:
+                self._file.close()
+            except OSError as e:
+                self.error = self.error or e
+
+    def _unlock(self) -> None:
+        if self._lock_fd is not None:
+            fd, self._lock_fd = self._lock_fd, None
+            try:
+                _release_lock(fd)
+            except OSError as e:
+                self.error = self.error or e
+
+    def close(self) -> None:
+        """
+        Flush pending answers, stop the writer and release the lock.
+        The journal stays on disk for resume.
+        """
+        try:
+            self._close_file()
+        finally:
+            self._unlock()
+
+    def discard(self) -> None:
+        """
+        Delete the journal (call once its answers are saved elsewhere), then release the lock.
+        Deleting before the lock is released keeps another window from picking it up.
+        Never raises for disk errors; check `error` afterwards.
+        """
+        try:
+            self._close_file()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.error = self.error or e
+        finally:
+            self._unlock()
+
+# ===== Session helper =====
+def open_session(
+    course_label: str,
+    load_questions: Callable[[str], List[Dict]],
+    confirm_resume: Optional[Callable[[int, int], bool]] = None,
+    journal_dir: str = JOURNAL_DIR,
+    lookup_questions: Callable[[str, List[int]], List[Dict]] = fetch_questions_by_id
+) -> Tuple[AnswerJournal, List[Dict], Dict[int, str], bool]:
+    """
+    Lock the course's journal, then resume its in-progress quiz or start a new one.
+
+    A saved quiz is only offered if its questions still match the database; that check
+    only looks up the saved ids (`lookup_questions`). `load_questions(course_label)` is
+    only called when starting fresh.
+    `confirm_resume(answered, total)` decides whether to resume (default: yes).
+    Raises JournalLockedError if another window already holds the journal.
+    Returns (journal, questions, answers, resumed).
+    """
+    path = journal_path(course_label, journal_dir)
+    lock_fd = _acquire_lock(path)
+    try:
+        saved = read_journal(path)
+        if saved and saved[0]:
+            questions, answers = saved
+            current = lookup_questions(course_label, [q["id"] for q in questions])
+            if _matches_db(questions, current) and (
+                confirm_resume is None or confirm_resume(len(answers), len(questions))
+            ):
+                return AnswerJournal(path, lock_fd), questions, answers, True
+        fresh = load_questions(course_label)
+        return AnswerJournal.create(path, fresh, lock_fd), fresh, {}, False
+    except BaseException:
+        _release_lock(lock_fd)
+        raise
+
+# Optional: run this file directly for a quick self-check (uses a temp folder)
+if __name__ == "__main__":
+    import tempfile
+
+    course = next(iter(COURSE_TABLES))
+    db = [
+        {"id": i, "text": f"Q{i}", "options": {"A": "a", "B": "b", "C": "c", "D": "d"},
+         "correct": "A", "explanation": ""}
+        for i in (1, 2, 3)
+    ]
+    qs = list(db)
+
+    def load_all(_label: str) -> List[Dict]:
+        return list(db)
+
+    def lookup(_label: str, ids: List[int]) -> List[Dict]:
+        return [q for q in db if q["id"] in ids]
+
+    def no_full_load(_label: str) -> List[Dict]:
+        raise AssertionError("resume must not reload every question")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = journal_path(course, tmp)
+
+        def session(load=load_all, confirm=None):
+            return open_session(course, load, confirm, tmp, lookup)
+
+        # record -> close -> read round-trip; last answer per question wins
+        j, got, answers, resumed = session()
+        assert got == qs and answers == {} and not resumed
+        j.record(1, "B"); j.record(2, "C"); j.record(1, "D")
+        j.close()
+        assert read_journal(path) == (qs, {2: "C", 1: "D"})
+
+        # torn last line is ignored on read and trimmed before new appends
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("A 3")
+        assert read_journal(path) == (qs, {2: "C", 1: "D"})
+
+        # resume keeps order + answers without a full reload; a second window is refused
+        j, got, answers, resumed = session(load=no_full_load)
+        assert resumed and got == qs and answers == {2: "C", 1: "D"}
+        try:
+            session()
+            raise AssertionError("second session should be locked out")
+        except JournalLockedError:
+            pass
+        j.record(3, "A")
+        j.close()
+        assert read_journal(path)[1] == {2: "C", 1: "D", 3: "A"}
+
+        # declining resume, or a question edited in the DB, starts a fresh journal
+        j, _, answers, resumed = session(confirm=lambda a, t: False)
+        assert not resumed and answers == {}
+        j.record(1, "A")
+        j.close()
+        db[0] = dict(db[0], correct="B")
+        j, got, answers, resumed = session()
+        assert not resumed and got == db and answers == {}
+
+        # write failures are kept on the journal instead of dying silently
+        j._file.close()
+        j.record(2, "B")
+        j._thread.join(timeout=5)
+        assert isinstance(j.error, ValueError)
+        j.close()
+
+        # discard after submit removes the journal and frees the lock
+        j, _, _, _ = session()
+        j.record(1, "A")
+        j.discard()
+        assert not os.path.exists(path)
+        j, _, _, resumed = session()
+        assert not resumed
+
+        # discard on a full disk records the error instead of raising, and still unlocks
+        if os.path.exists("/dev/full"):
+            j._file.close()
+            j._file = open("/dev/full", "a", encoding="utf-8")
+            j.record(2, "B")
+            j._thread.join(timeout=5)
+            j._file.write("pending")  # left in the buffer; the final flush fails
+            j.discard()
+            assert isinstance(j.error, OSError) and j._lock_fd is None
+            j, _, _, _ = session()
+        j.discard()
+
+    print("answerJournal self-check passed")
+
+#Completed answerJournal.py
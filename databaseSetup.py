@@ -1,5 +1,6 @@
 import sqlite3
 import random
+import json
 from typing import Dict, List, Tuple, Optional
 
 # ===== Public constants =====
@@ -39,9 +40,22 @@ CREATE TABLE IF NOT EXISTS {table_name} (
 );
 """
 
+# One row per submitted quiz; answers kept compactly as {"question_id": "letter"} JSON.
+_ATTEMPTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Quiz_Attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_label TEXT NOT NULL,
+    submitted_at TEXT NOT NULL DEFAULT (datetime('now')),
+    score INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    answers TEXT NOT NULL
+);
+"""
+
 def _create_tables(cur: sqlite3.Cursor) -> None:
     for t in COURSE_TABLES.values():
         cur.execute(_TABLE_SCHEMA.format(table_name=t))
+    cur.execute(_ATTEMPTS_SCHEMA)
 
 def _normalize_block(
     rows: List[Tuple[str, str, str, str, str, str]]
@@ -115,6 +129,19 @@ def count_questions(db_path: str = DB_DEFAULT_PATH) -> Dict[str, int]:
             counts[label] = int(cur.fetchone()[0])
     return counts
 
+_QUESTION_COLUMNS = (
+    "id, question_text, option_A, option_B, option_C, option_D, correct_option, COALESCE(explanation, '')"
+)
+
+def _row_to_question(r: Tuple) -> Dict:
+    return {
+        "id": r[0],
+        "text": r[1],
+        "options": {"A": r[2], "B": r[3], "C": r[4], "D": r[5]},
+        "correct": r[6],
+        "explanation": r[7],
+    }
+
 def fetch_questions(
     course_label: str,
     db_path: str = DB_DEFAULT_PATH,
@@ -137,30 +164,67 @@ def fetch_questions(
     with get_connection(db_path) as conn:
         cur = conn.cursor()
         cur.execute(f"""
-            SELECT id, question_text, option_A, option_B, option_C, option_D, correct_option, COALESCE(explanation, '')
+            SELECT {_QUESTION_COLUMNS}
             FROM {table};
         """)
         rows = cur.fetchall()
 
-    questions = [
-        {
-            "id": r[0],
-            "text": r[1],
-            "options": {"A": r[2], "B": r[3], "C": r[4], "D": r[5]},
-            "correct": r[6],
-            "explanation": r[7],
-        }
-        for r in rows
-    ]
+    questions = [_row_to_question(r) for r in rows]
     if shuffle:
         random.shuffle(questions)
     return questions[:limit] if (limit and limit > 0) else questions
 
+def fetch_questions_by_id(
+    course_label: str,
+    ids: List[int],
+    db_path: str = DB_DEFAULT_PATH
+) -> List[Dict]:
+    """
+    Same shape as fetch_questions(), but only the given ids (missing ids are skipped).
+    Used to check a saved quiz against the current questions without loading them all.
+    """
+    if course_label not in COURSE_TABLES:
+        raise ValueError(f"Unknown course label: {course_label}")
+    if not ids:
+        return []
+
+    table = COURSE_TABLES[course_label]
+    placeholders = ", ".join("?" for _ in ids)
+    with get_connection(db_path) as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT {_QUESTION_COLUMNS} FROM {table} WHERE id IN ({placeholders});", list(ids))
+        rows = cur.fetchall()
+    return [_row_to_question(r) for r in rows]
+
 def grade_quiz(user_answers: Dict[int, str], questions: List[Dict]) -> int:
     lookup = {q["id"]: q for q in questions}
     return sum(1 for qid, ans in user_answers.items()
                if qid in lookup and ans == lookup[qid]["correct"])
 
+def save_quiz_attempt(
+    course_label: str,
+    user_answers: Dict[int, str],
+    score: int,
+    total: int,
+    db_path: str = DB_DEFAULT_PATH
+) -> int:
+    """
+    Store a submitted quiz (e.g. the compacted answer journal). Returns the new attempt id.
+    """
+    if course_label not in COURSE_TABLES:
+        raise ValueError(f"Unknown course label: {course_label}")
+
+    answers_json = json.dumps({str(k): v for k, v in user_answers.items()}, separators=(",", ":"))
+    with get_connection(db_path) as conn:
+        cur = conn.cursor()
+        cur.execute(_ATTEMPTS_SCHEMA)
+        cur.execute(
+            "INSERT INTO Quiz_Attempts (course_label, score, total, answers) VALUES (?, ?, ?, ?);",
+            (course_label, score, total, answers_json),
+        )
+        conn.commit()
+        return int(cur.lastrowid)
+
 # ===== Seed data (your original questions) =====
 def _seed_data() -> Dict[str, List[Tuple[str, str, str, str, str, str]]]:
     business_applications = [
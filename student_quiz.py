@@ -2,7 +2,8 @@ import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, List
-from databaseSetup import fetch_questions, grade_quiz, list_courses, ensure_db_ready
+from databaseSetup import fetch_questions, grade_quiz, list_courses, ensure_db_ready, save_quiz_attempt
+from answerJournal import open_session, JournalLockedError
 
 # ---------- Helpers ----------
 def pick_course_if_needed() -> str:
@@ -49,16 +50,34 @@ def load_questions_or_die(course_name: str) -> List[Dict]:
         sys.exit(1)
     return qs
 
+def ask_resume(answered: int, total: int) -> bool:
+    return messagebox.askyesno(
+        "Resume quiz?",
+        f"You have an unfinished {COURSE} quiz ({answered}/{total} answered).\n\n"
+        f"Resume it? Choose No to start over."
+    )
+
 # ---------- Ensure DB ready ----------
 ensure_db_ready()
 
 # ---------- Course selection ----------
 COURSE = sys.argv[1] if len(sys.argv) >= 2 else pick_course_if_needed()
-questions = load_questions_or_die(COURSE)
 
 # ---------- State ----------
-user_answers: Dict[int, str] = {}
+# Resume an unfinished quiz (same question order + answers) from its journal, else start fresh.
+try:
+    journal, questions, user_answers, resumed = open_session(COURSE, load_questions_or_die, ask_resume)
+except JournalLockedError:
+    messagebox.showwarning("Quiz already open", f"The {COURSE} quiz is already open in another window.")
+    sys.exit(0)
+except (ValueError, OSError) as e:
+    messagebox.showerror("Load error", f"Failed to open a quiz session for {COURSE}.\n\n{e}")
+    sys.exit(1)
 idx = 0
+if resumed and user_answers:
+    # Pick up where the student left off (last answered question).
+    last_qid = next(reversed(list(user_answers)))
+    idx = next(i for i, q in enumerate(questions) if q["id"] == last_qid)
 
 # ---------- Functions ----------
 def render_question(i: int) -> None:
@@ -73,6 +92,7 @@ def render_question(i: int) -> None:
 def on_choice() -> None:
     qid = questions[idx]["id"]
     user_answers[qid] = choice_var.get()
+    journal.record(qid, user_answers[qid])  # queued; written off the UI thread
 
 def move(delta: int) -> None:
     global idx
@@ -93,15 +113,48 @@ def check_current() -> None:
     messagebox.showinfo("Feedback", msg)
 
 def submit_quiz() -> None:
+    global journal
     if len(user_answers) < len(questions):
         if not messagebox.askyesno("Unanswered", "Some questions are unanswered. Submit anyway?"):
             return
     score = grade_quiz(user_answers, questions)
+    try:
+        save_quiz_attempt(COURSE, user_answers, score, len(questions))
+    except Exception as e:
+        # Keep the journal so nothing is lost; the student can submit again.
+        messagebox.showerror("Save error", f"Failed to save your quiz.\n\n{e}")
+        return
+    # Compacted into the DB; nothing left to resume. The attempt is already saved,
+    # so a cleanup problem must not leave the window open for a second submit.
+    try:
+        journal.discard()
+    except Exception:
+        pass
+    journal = None
     messagebox.showinfo("Final Score", f"{COURSE}\n\nScore: {score}/{len(questions)}")
+    root.destroy()  # one attempt per session; no duplicate submits
+
+def poll_journal() -> None:
+    # The journal writes in the background, so check for write errors periodically.
+    if journal is None:
+        return
+    if journal.error is not None:
+        messagebox.showerror("Answers not saved",
+                             "Your answers can no longer be saved to disk and will be lost "
+                             f"if this window closes before you submit.\n\n{journal.error}")
+        return
+    root.after(1000, poll_journal)
+
+def on_close() -> None:
+    # Flush pending answers; the journal stays on disk so the quiz can be resumed.
+    if journal is not None:
+        journal.close()
+    root.destroy()
 
 # ---------- GUI Layout ----------
 root = tk.Tk()
 root.title(f"{COURSE} Quiz")
+root.protocol("WM_DELETE_WINDOW", on_close)
 root.geometry("720x520")
 root.configure(bg="#F9F9F9")
 
@@ -146,6 +199,7 @@ tk.Button(frame, text="Submit Quiz", width=12, command=submit_quiz).pack(pady=6)
 
 # Start with first question
 render_question(idx)
+poll_journal()
 
 root.mainloop()
 